@@ -6,27 +6,125 @@
 # Installation copies the .app bundle to ~/Applications/ and creates
 #  a .desktop file in ~/.local/share/applications/.
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 import gi
 import os
 import shutil
-import configparser
+import stat
+import fcntl
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 gi.require_version('Gtk', '4.0')
-from gi.repository import GObject, Adw, Gtk, Nautilus, Gio
+from gi.repository import GObject, GLib, Nautilus, Gio
 
 # Track which apps have been prompted for installation
 PROMPTED_APPS_FILE = os.path.expanduser("~/.config/nautilus-app-bundle-prompted.txt")
 
-def get_prompted_apps():
+# Maximum number of bundles remembered by each of the caches below
+CACHE_MAX_ENTRIES = 256
+
+# Bundle path -> (bundle inode, custom icon URI) already set in this session
+_CUSTOM_ICONS: 'OrderedDict[str, Tuple[int, str]]' = OrderedDict()
+
+# InstallDialog class, created on first use so Adw/Gtk load only when needed
+_INSTALL_DIALOG_CLASS = None
+
+# Prompted apps, loaded from PROMPTED_APPS_FILE on first use
+_PROMPTED: Optional[Set[str]] = None
+
+# ioctl request for cloning a file's contents (reflink) on btrfs/xfs
+FICLONE = 0x40049409
+
+# Fields read from the [Desktop Entry] group and their defaults
+DESKTOP_ENTRY_DEFAULTS = {
+    'Name': '',
+    'Exec': '',
+    'Icon': '',
+    'Terminal': 'false',
+    'Categories': 'Application;',
+    'Type': 'Application',
+    'StartupNotify': 'true',
+}
+
+# .desktop files at least this large are parsed with GLib.KeyFile
+FAST_PARSE_MAX_SIZE = 4096
+
+# Cached .desktop lookups, so Nautilus redraws don't hit the disk every time.
+# ctime changes on content and metadata changes (e.g. chmod), mtime only on the former.
+# Bundle path -> (directory ctime_ns, directory inode, .desktop file path)
+_DESKTOP_PATH_CACHE: 'OrderedDict[str, Tuple[int, int, Optional[str]]]' = OrderedDict()
+# .desktop file path -> (ctime_ns, size, parsed fields)
+_DESKTOP_CACHE: 'OrderedDict[str, Tuple[int, int, Optional[Dict[str, str]]]]' = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key: str):
+    """Get a cache entry and mark it as recently used"""
+    value = cache.get(key)
+    if value is not None:
+        try:
+            cache.move_to_end(key)
+        except KeyError:
+            # Evicted meanwhile by the install thread
+            pass
+    return value
+
+
+def _cache_put(cache: OrderedDict, key: str, value):
+    """Store a cache entry, evicting the least recently used one when full"""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_MAX_ENTRIES:
+        try:
+            cache.popitem(last=False)
+        except KeyError:
+            break
+
+
+def _write_file_atomic(path: str, content: str):
+    """Write a file through a temporary file and rename it into place"""
+    tmp_path = path + '.tmp'
+    try:
+        Path(tmp_path).write_text(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave the temporary file behind (e.g. disk full)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def get_prompted_apps() -> Set[str]:
     """Get the set of apps that have already been prompted"""
-    if not os.path.exists(PROMPTED_APPS_FILE):
-        return set()
-    with open(PROMPTED_APPS_FILE, 'r') as f:
-        return set(line.strip() for line in f.readlines())
+    global _PROMPTED
+    if _PROMPTED is None:
+        try:
+            with open(PROMPTED_APPS_FILE, 'r') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+        _PROMPTED = set(lines)
+        
+        # Older versions appended duplicates, rewrite the file without them
+        if len(lines) > len(_PROMPTED):
+            try:
+                _write_file_atomic(PROMPTED_APPS_FILE, ''.join(path + '\n' for path in _PROMPTED))
+            except OSError:
+                pass
+    return _PROMPTED
 
 
 def mark_app_prompted(app_path: str):
     """Mark an app as having been prompted"""
+    prompted_apps = get_prompted_apps()
+    if app_path in prompted_apps:
+        return
+    prompted_apps.add(app_path)
+    
     os.makedirs(os.path.dirname(PROMPTED_APPS_FILE), exist_ok=True)
     with open(PROMPTED_APPS_FILE, 'a') as f:
         f.write(app_path + '\n')
@@ -34,10 +132,11 @@ def mark_app_prompted(app_path: str):
 
 def is_app_bundle(file: Nautilus.FileInfo) -> bool:
     """Check if a file is an .app bundle"""
-    if not file.is_directory() or not file.get_name().endswith('.app'):
+    # Cheap name check first, no filesystem access for ordinary files
+    if not file.get_name().endswith('.app'):
         return False
     
-    # Check if .desktop file exists
+    # Check if .desktop file exists (non-directories yield no .desktop file)
     app_path = file.get_location().get_path()
     desktop_file = get_desktop_file_path(app_path)
     return desktop_file is not None
@@ -45,47 +144,157 @@ def is_app_bundle(file: Nautilus.FileInfo) -> bool:
 
 def get_desktop_file_path(app_path: str) -> Optional[str]:
     """Get the .desktop file path inside the app bundle"""
+    try:
+        st = os.stat(app_path)
+    except OSError:
+        _DESKTOP_PATH_CACHE.pop(app_path, None)
+        return None
+    
+    # Reuse the previous lookup while the bundle directory is unchanged
+    cached = _cache_get(_DESKTOP_PATH_CACHE, app_path)
+    if cached and cached[0] == st.st_ctime_ns and cached[1] == st.st_ino:
+        return cached[2]
+    
     # Look for .desktop files in the app bundle
-    if not os.path.isdir(app_path):
+    desktop_file = None
+    try:
+        with os.scandir(app_path) as entries:
+            for entry in entries:
+                if entry.name.endswith('.desktop'):
+                    desktop_file = os.path.join(app_path, entry.name)
+                    break
+    except NotADirectoryError:
+        pass
+    except OSError:
+        # Don't cache failures like PermissionError, they may go away
+        _DESKTOP_PATH_CACHE.pop(app_path, None)
         return None
     
-    for filename in os.listdir(app_path):
-        if filename.endswith('.desktop'):
-            return os.path.join(app_path, filename)
-    return None
+    _cache_put(_DESKTOP_PATH_CACHE, app_path, (st.st_ctime_ns, st.st_ino, desktop_file))
+    return desktop_file
+
 
+def get_bundle_inode(app_path: str) -> Optional[int]:
+    """Get the bundle directory's inode as seen by the last get_desktop_file_path call"""
+    cached = _DESKTOP_PATH_CACHE.get(app_path)
+    return cached[1] if cached else None
 
-def parse_desktop_file(app_path: str) -> Optional[Dict[str, str]]:
-    """Parse the .desktop file and return relevant fields"""
+
+def parse_desktop_file(app_path: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Parse the .desktop file and return its path and relevant fields"""
     desktop_file = get_desktop_file_path(app_path)
     if not desktop_file:
         return None
     
     try:
-        config = configparser.ConfigParser()
-        config.read(desktop_file)
-        
-        if 'Desktop Entry' not in config:
-            return None
-        
-        entry = config['Desktop Entry']
-        return {
-            'Name': entry.get('Name', ''),
-            'Exec': entry.get('Exec', ''),
-            'Icon': entry.get('Icon', ''),
-            'Terminal': entry.get('Terminal', 'false'),
-            'Categories': entry.get('Categories', 'Application;'),
-            'Type': entry.get('Type', 'Application'),
-            'StartupNotify': entry.get('StartupNotify', 'true'),
-        }
-    except Exception:
+        st = os.stat(desktop_file)
+    except FileNotFoundError:
+        _DESKTOP_CACHE.pop(desktop_file, None)
+        _DESKTOP_PATH_CACHE.pop(app_path, None)
+        return None
+    except OSError:
+        return None
+    
+    # Reuse the parsed fields while the .desktop file is unchanged
+    cached = _cache_get(_DESKTOP_CACHE, desktop_file)
+    if cached and cached[0] == st.st_ctime_ns and cached[1] == st.st_size:
+        desktop_info = cached[2]
+    else:
+        desktop_info = _read_desktop_file(desktop_file)
+        _cache_put(_DESKTOP_CACHE, desktop_file, (st.st_ctime_ns, st.st_size, desktop_info))
+    
+    if not desktop_info:
         return None
+    return desktop_file, desktop_info
+
+
+def _read_desktop_file(desktop_file: str) -> Optional[Dict[str, str]]:
+    """Read the relevant fields from a .desktop file on disk"""
+    desktop_info = _fast_parse_desktop(desktop_file)
+    if desktop_info is not None:
+        return desktop_info
+    return _parse_desktop_key_file(desktop_file)
+
+
+def _fast_parse_desktop(desktop_file: str) -> Optional[Dict[str, str]]:
+    """Parse a small, plain .desktop file with a single read.
+    
+    Returns None for anything it doesn't handle (large files, escape
+    sequences, invalid UTF-8, no [Desktop Entry] group), so the caller
+    can fall back to GLib.KeyFile.
+    """
+    try:
+        fd = os.open(desktop_file, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        data = os.read(fd, FAST_PARSE_MAX_SIZE)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    
+    # Possibly truncated, or needs unescaping
+    if len(data) >= FAST_PARSE_MAX_SIZE or b'\\' in data:
+        return None
+    
+    start = data.find(b'[Desktop Entry]')
+    if start == -1 or (start > 0 and data[start - 1] != ord('\n')):
+        return None
+    
+    try:
+        text = data[start + len(b'[Desktop Entry]'):].decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    
+    desktop_info = dict(DESKTOP_ENTRY_DEFAULTS)
+    for line in text.split('\n'):
+        line = line.strip()
+        if line.startswith('['):
+            # Start of the next group
+            break
+        key, sep, value = line.partition('=')
+        key = key.strip()
+        if sep and key in desktop_info:
+            desktop_info[key] = value.strip()
+    return desktop_info
+
+
+def _parse_desktop_key_file(desktop_file: str) -> Optional[Dict[str, str]]:
+    """Read the relevant fields from a .desktop file using GLib.KeyFile"""
+    key_file = GLib.KeyFile()
+    try:
+        key_file.load_from_file(desktop_file, GLib.KeyFileFlags.NONE)
+    except GLib.Error:
+        return None
+    
+    if not key_file.has_group('Desktop Entry'):
+        return None
+    
+    desktop_info = {}
+    for key, default in DESKTOP_ENTRY_DEFAULTS.items():
+        try:
+            desktop_info[key] = key_file.get_string('Desktop Entry', key)
+        except GLib.Error:
+            desktop_info[key] = default
+    return desktop_info
+
 
+def _get_bundle_info(file: Nautilus.FileInfo) -> Optional[Dict[str, str]]:
+    """Get the parsed .desktop fields of an .app bundle, or None if it isn't one.
+    
+    The caller is expected to have checked the .app suffix already.
+    """
+    info = parse_desktop_file(file.get_location().get_path())
+    return info[1] if info else None
 
-def get_app_icon_path(file: Nautilus.FileInfo) -> Optional[str]:
+
+def get_app_icon_path(file: Nautilus.FileInfo, desktop_info: Optional[Dict[str, str]] = None) -> Optional[str]:
     """Get the icon path for an app bundle from .desktop file"""
     app_path = file.get_location().get_path()
-    desktop_info = parse_desktop_file(app_path)
+    if desktop_info is None:
+        info = parse_desktop_file(app_path)
+        desktop_info = info[1] if info else None
     
     if not desktop_info or not desktop_info['Icon']:
         return None
@@ -102,12 +311,12 @@ def get_app_icon_path(file: Nautilus.FileInfo) -> Optional[str]:
 
 def get_app_exec_path(app_path: str) -> Optional[str]:
     """Get the executable path for an app bundle from .desktop file"""
-    desktop_info = parse_desktop_file(app_path)
+    info = parse_desktop_file(app_path)
     
-    if not desktop_info or not desktop_info['Exec']:
+    if not info or not info[1]['Exec']:
         return None
     
-    exec_path = desktop_info['Exec']
+    exec_path = info[1]['Exec']
     # If relative path, make it absolute
     if not os.path.isabs(exec_path):
         exec_path = os.path.join(app_path, exec_path)
@@ -115,8 +324,29 @@ def get_app_exec_path(app_path: str) -> Optional[str]:
     return exec_path
 
 
-def message_alert(heading: str, body: str, dismiss_label: str = 'Dismiss', parent: Adw.Dialog = None):
+def _make_executable(exec_path: str):
+    """Make a file executable, skipping the chmod when it already is"""
+    st = os.stat(exec_path)
+    if (st.st_mode & 0o111) != 0o111:
+        os.chmod(exec_path, stat.S_IMODE(st.st_mode) | 0o755)
+
+
+def _spawn_app(exec_path: str):
+    """Start an app executable as a child of the Nautilus process"""
+    # DO_NOT_REAP_CHILD avoids GLib's extra intermediate fork; reap the child
+    # from the main loop instead so it doesn't linger as a zombie
+    pid = GLib.spawn_async(
+        argv=[exec_path],
+        working_directory=os.path.dirname(exec_path),
+        flags=GLib.SpawnFlags.DO_NOT_REAP_CHILD,
+    )[0]
+    GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, lambda pid, status: GLib.spawn_close_pid(pid))
+
+
+def message_alert(heading: str, body: str, dismiss_label: str = 'Dismiss', parent: 'Adw.Dialog' = None):
     """Show an alert dialog"""
+    from gi.repository import Adw
+    
     dialog = Adw.AlertDialog(
         heading=heading,
         body=body,
@@ -133,7 +363,7 @@ def launch_app_bundle(file: Nautilus.FileInfo):
     app_path = file.get_location().get_path()
     exec_path = get_app_exec_path(app_path)
     
-    if not exec_path or not os.path.exists(exec_path):
+    if not exec_path:
         message_alert(
             heading="Launch Error",
             body=f"Executable not found in .app bundle",
@@ -142,7 +372,13 @@ def launch_app_bundle(file: Nautilus.FileInfo):
     
     # Make binary executable
     try:
-        os.chmod(exec_path, 0o755)
+        _make_executable(exec_path)
+    except FileNotFoundError:
+        message_alert(
+            heading="Launch Error",
+            body=f"Executable not found in .app bundle",
+        )
+        return
     except Exception as e:
         message_alert(
             heading="Launch Error",
@@ -155,12 +391,11 @@ def launch_app_bundle(file: Nautilus.FileInfo):
     
     if app_path not in prompted_apps:
         # Show installation dialog
-        InstallDialog(file).present()
+        get_install_dialog_class()(file).present()
     else:
         # Just launch the app
-        import subprocess
         try:
-            subprocess.Popen([exec_path], cwd=os.path.dirname(exec_path))
+            _spawn_app(exec_path)
         except Exception as e:
             message_alert(
                 heading="Launch Error",
@@ -168,19 +403,135 @@ def launch_app_bundle(file: Nautilus.FileInfo):
             )
 
 
-def install_app_bundle(file: Nautilus.FileInfo):
-    """Install the app bundle by copying to ~/Applications/ and creating .desktop file"""
-    source_app_path = file.get_location().get_path()
-    app_name = file.get_name()
+def _reflink_copy(src: str, dst: str) -> str:
+    """Copy a file as a reflink (copy-on-write clone) when the filesystem supports it"""
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError:
+        # Not supported (e.g. ext4 or across filesystems), do a regular copy
+        return shutil.copy2(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _fast_copytree(src: str, dst: str):
+    """Copy a directory tree, cloning file contents where possible"""
+    try:
+        # -H: if the bundle itself is a symlink, copy its contents rather than the link
+        subprocess.run(['cp', '-a', '-H', '--reflink=auto', '--', src, dst], check=True, capture_output=True)
+        return
+    except FileNotFoundError:
+        # cp is not available, copy in-process instead
+        pass
+    except subprocess.CalledProcessError as e:
+        if os.path.lexists(dst):
+            # cp failed partway through, don't leave a partial tree behind
+            if os.path.isdir(dst) and not os.path.islink(dst):
+                shutil.rmtree(dst)
+            else:
+                os.unlink(dst)
+            raise OSError(e.stderr.decode(errors='replace').strip() or f"cp exited with status {e.returncode}")
+        # cp failed before copying anything (e.g. no --reflink support), copy in-process instead
+    
+    # Mirroring into an empty destination copies everything
+    _mirror_tree(src, dst)
+
+
+def _entry_kind(entry: os.DirEntry) -> str:
+    """Classify a directory entry without following symlinks"""
+    if entry.is_symlink():
+        return 'link'
+    if entry.is_dir(follow_symlinks=False):
+        return 'dir'
+    if entry.is_file(follow_symlinks=False):
+        return 'file'
+    # FIFOs, sockets, device nodes
+    return 'special'
+
+
+def _mirror_tree(src: str, dst: str, workers: int = 8):
+    """Make dst identical to src, copying only files that were added or changed"""
+    mirrored_dirs = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        _mirror_dir(src, dst, executor, futures, mirrored_dirs)
+        
+        # Re-raise the first copy error, if any
+        for future in futures:
+            future.result()
+    
+    # Directory timestamps change while files are added, so copy them last
+    for src_dir, dst_dir in reversed(mirrored_dirs):
+        shutil.copystat(src_dir, dst_dir)
+
+
+def _mirror_dir(src: str, dst: str, executor: ThreadPoolExecutor, futures: List, mirrored_dirs: List[Tuple[str, str]]):
+    """Mirror one directory level, submitting file copies to the executor"""
+    os.makedirs(dst, exist_ok=True)
+    mirrored_dirs.append((src, dst))
+    with os.scandir(src) as entries:
+        src_entries = {entry.name: entry for entry in entries}
+    
+    # Delete whatever is no longer in the source (or changed its kind)
+    with os.scandir(dst) as entries:
+        for entry in entries:
+            src_entry = src_entries.get(entry.name)
+            if src_entry is not None and _entry_kind(src_entry) == _entry_kind(entry):
+                continue
+            if _entry_kind(entry) == 'dir':
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+    
+    for name, entry in src_entries.items():
+        dst_path = os.path.join(dst, name)
+        kind = _entry_kind(entry)
+        
+        if kind == 'dir':
+            _mirror_dir(entry.path, dst_path, executor, futures, mirrored_dirs)
+        elif kind == 'link':
+            target = os.readlink(entry.path)
+            if os.path.islink(dst_path):
+                if os.readlink(dst_path) == target:
+                    continue
+                os.unlink(dst_path)
+            os.symlink(target, dst_path)
+        elif kind == 'special':
+            # Opening a FIFO would block forever, let copy2 raise SpecialFileError
+            shutil.copy2(entry.path, dst_path)
+        else:
+            src_stat = entry.stat(follow_symlinks=False)
+            try:
+                dst_stat = os.stat(dst_path, follow_symlinks=False)
+            except FileNotFoundError:
+                dst_stat = None
+            
+            if dst_stat is not None:
+                # Skip files that are already up to date
+                if dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                    continue
+                os.unlink(dst_path)
+            futures.append(executor.submit(_reflink_copy, entry.path, dst_path))
+
+
+def install_app_bundle(source_app_path: str, app_name: str):
+    """Install the app bundle by copying to ~/Applications/ and creating .desktop file.
     
+    Called from a worker thread, so it takes plain paths and must not touch
+    GTK or Nautilus objects directly.
+    """
     # Parse the .desktop file from the source
-    desktop_info = parse_desktop_file(source_app_path)
-    if not desktop_info:
-        message_alert(
-            heading="Installation Error",
-            body="Failed to read .desktop file from app bundle",
+    info = parse_desktop_file(source_app_path)
+    if not info:
+        # Runs on a worker thread, so show the alert from the main loop
+        GLib.idle_add(
+            message_alert,
+            "Installation Error",
+            "Failed to read .desktop file from app bundle",
         )
         return False
+    original_desktop_file, desktop_info = info
     
     try:
         # Create ~/Applications/ directory if it doesn't exist
@@ -190,15 +541,17 @@ def install_app_bundle(file: Nautilus.FileInfo):
         # Copy the entire .app bundle to ~/Applications/
         dest_app_path = os.path.join(applications_dir, app_name)
         
-        # If destination exists, remove it first
-        if os.path.exists(dest_app_path):
-            shutil.rmtree(dest_app_path)
-        
-        shutil.copytree(source_app_path, dest_app_path)
+        # If destination is a real directory, only update what changed.
+        # Never mirror through a symlink, that would delete files in its target.
+        if os.path.isdir(dest_app_path) and not os.path.islink(dest_app_path):
+            _mirror_tree(source_app_path, dest_app_path)
+        else:
+            if os.path.lexists(dest_app_path):
+                os.unlink(dest_app_path)
+            _fast_copytree(source_app_path, dest_app_path)
         
         # Create .desktop file in ~/.local/share/applications/ with absolute paths
         # Use the original .desktop filename from the bundle
-        original_desktop_file = get_desktop_file_path(source_app_path)
         desktop_file_name = os.path.basename(original_desktop_file)
         desktop_file_path = os.path.expanduser(f"~/.local/share/applications/{desktop_file_name}")
         
@@ -213,137 +566,195 @@ def install_app_bundle(file: Nautilus.FileInfo):
         elif not icon_path:
             icon_path = 'application-x-executable'
         
+        # Make the executable executable (in case it wasn't). Checked before
+        # writing the launcher, so a broken install never gets a menu entry.
+        try:
+            _make_executable(exec_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Executable not found in installed bundle: {exec_path}")
+        
         # Create the .desktop file content
-        desktop_content = f"""[Desktop Entry]
-Type={desktop_info['Type']}
-Name={desktop_info['Name']}
-Exec={exec_path}
-Icon={icon_path}
-Terminal={desktop_info['Terminal']}
-Categories={desktop_info['Categories']}
-StartupNotify={desktop_info['StartupNotify']}
-"""
+        lines = [
+            '[Desktop Entry]',
+            f"Type={desktop_info['Type']}",
+            f"Name={desktop_info['Name']}",
+            f"Exec={exec_path}",
+            f"Icon={icon_path}",
+            f"Terminal={desktop_info['Terminal']}",
+            f"Categories={desktop_info['Categories']}",
+            f"StartupNotify={desktop_info['StartupNotify']}",
+        ]
+        desktop_content = '\n'.join(lines) + '\n'
         
+        # Write to a temporary file and rename it into place, so the menu
+        # never sees a partially written .desktop file
         os.makedirs(os.path.dirname(desktop_file_path), exist_ok=True)
-        with open(desktop_file_path, 'w') as f:
-            f.write(desktop_content)
-        
-        # Make the executable executable (in case it wasn't)
-        if os.path.exists(exec_path):
-            os.chmod(exec_path, 0o755)
+        _write_file_atomic(desktop_file_path, desktop_content)
         
         return True
     except Exception as e:
-        message_alert(
-            heading="Installation Error",
-            body=f"Failed to install application: {e}",
+        GLib.idle_add(
+            message_alert,
+            "Installation Error",
+            f"Failed to install application: {e}",
         )
         return False
 
 
-class InstallDialog(Adw.Dialog):
-    def __init__(self, file: Nautilus.FileInfo):
-        super().__init__()
-        
-        self.file = file
-        self.app_path = file.get_location().get_path()
-        self.app_name = file.get_name()[:-4]
-        
-        # Set up the dialog
-        self.set_title('Install Application')
-        self.set_content_width(400)
-        
-        root = Adw.ToolbarView()
-        header_bar = Adw.HeaderBar()
-        header_bar.set_decoration_layout(':close')
-        root.add_top_bar(header_bar)
+def _make_install_dialog_class():
+    """Create the InstallDialog class. Adw and Gtk are only imported here, on first use"""
+    from gi.repository import Adw, Gtk
+    
+    class InstallDialog(Adw.Dialog):
+        def __init__(self, file: Nautilus.FileInfo):
+            super().__init__()
+            
+            self.file = file
+            self.app_path = file.get_location().get_path()
+            self.bundle_name = file.get_name()
+            self.app_name = self.bundle_name[:-4]
+            
+            # Set up the dialog
+            self.set_title('Install Application')
+            self.set_content_width(400)
+            
+            root = Adw.ToolbarView()
+            header_bar = Adw.HeaderBar()
+            header_bar.set_decoration_layout(':close')
+            root.add_top_bar(header_bar)
+            
+            body = Gtk.Box(
+                orientation=Gtk.Orientation.VERTICAL,
+                hexpand=True,
+                spacing=16,
+                margin_top=16,
+                margin_bottom=16,
+                margin_start=16,
+                margin_end=16,
+            )
+            root.set_content(body)
+            
+            # Message
+            message = Gtk.Label(
+                label=f"Do you want to install '{self.app_name}'?\n\nThis will create a launcher in your applications menu.",
+                wrap=True,
+                justify=Gtk.Justification.CENTER,
+            )
+            body.append(message)
+            
+            # Buttons
+            button_box = Gtk.Box(
+                orientation=Gtk.Orientation.HORIZONTAL,
+                spacing=8,
+                halign=Gtk.Align.CENTER,
+            )
+            body.append(button_box)
+            
+            self.no_button = Gtk.Button(
+                label='No',
+                css_classes=['pill'],
+            )
+            self.no_button.connect('clicked', lambda *_: self.on_no_clicked())
+            button_box.append(self.no_button)
+            
+            self.yes_button = Gtk.Button(
+                label='Yes, Install',
+                css_classes=['pill', 'suggested-action'],
+            )
+            self.yes_button.connect('clicked', lambda *_: self.on_yes_clicked())
+            button_box.append(self.yes_button)
+            
+            # Shown while the installation is running
+            self.spinner = Gtk.Spinner(
+                halign=Gtk.Align.CENTER,
+                visible=False,
+            )
+            body.append(self.spinner)
+            
+            self.set_child(root)
         
-        body = Gtk.Box(
-            orientation=Gtk.Orientation.VERTICAL,
-            hexpand=True,
-            spacing=16,
-            margin_top=16,
-            margin_bottom=16,
-            margin_start=16,
-            margin_end=16,
-        )
-        root.set_content(body)
+        def on_yes_clicked(self):
+            # Install the app bundle in the background so Nautilus stays responsive
+            self.no_button.set_sensitive(False)
+            self.yes_button.set_sensitive(False)
+            self.spinner.set_visible(True)
+            self.spinner.start()
+            self.set_can_close(False)
+            threading.Thread(target=self._do_install, daemon=True).start()
         
-        # Message
-        message = Gtk.Label(
-            label=f"Do you want to install '{self.app_name}'?\n\nThis will create a launcher in your applications menu.",
-            wrap=True,
-            justify=Gtk.Justification.CENTER,
-        )
-        body.append(message)
+        def _do_install(self):
+            """Run the installation on a worker thread"""
+            ok = False
+            try:
+                ok = install_app_bundle(self.app_path, self.bundle_name)
+            finally:
+                # Always hand control back, so the dialog never stays stuck
+                GLib.idle_add(self._install_done, ok)
         
-        # Buttons
-        button_box = Gtk.Box(
-            orientation=Gtk.Orientation.HORIZONTAL,
-            spacing=8,
-            halign=Gtk.Align.CENTER,
-        )
-        body.append(button_box)
+        def _install_done(self, ok: bool) -> bool:
+            """Finish the installation on the main loop"""
+            self.spinner.stop()
+            self.set_can_close(True)
+            if ok:
+                mark_app_prompted(self.app_path)
+                # Launch the installed app
+                self.launch_installed_app()
+            self.close()
+            return GLib.SOURCE_REMOVE
         
-        no_button = Gtk.Button(
-            label='No',
-            css_classes=['pill'],
-        )
-        no_button.connect('clicked', lambda *_: self.on_no_clicked())
-        button_box.append(no_button)
+        def on_no_clicked(self):
+            # Mark as prompted but don't install
+            mark_app_prompted(self.app_path)
+            # Launch the app
+            self.launch_app()
+            self.close()
         
-        yes_button = Gtk.Button(
-            label='Yes, Install',
-            css_classes=['pill', 'suggested-action'],
-        )
-        yes_button.connect('clicked', lambda *_: self.on_yes_clicked())
-        button_box.append(yes_button)
+        def launch_app(self):
+            """Launch the app from the original location"""
+            exec_path = get_app_exec_path(self.app_path)
+            if exec_path:
+                try:
+                    _make_executable(exec_path)
+                    _spawn_app(exec_path)
+                except FileNotFoundError:
+                    message_alert(
+                        heading="Launch Error",
+                        body=f"Executable not found in .app bundle",
+                    )
+                except Exception as e:
+                    message_alert(
+                        heading="Launch Error",
+                        body=f"Failed to launch application: {e}",
+                    )
         
-        self.set_child(root)
+        def launch_installed_app(self):
+            """Launch the app from the installed location"""
+            installed_app_path = os.path.expanduser(f"~/Applications/{self.bundle_name}")
+            exec_path = get_app_exec_path(installed_app_path)
+            if exec_path:
+                try:
+                    _make_executable(exec_path)
+                    _spawn_app(exec_path)
+                except FileNotFoundError:
+                    message_alert(
+                        heading="Launch Error",
+                        body=f"Executable not found in .app bundle",
+                    )
+                except Exception as e:
+                    message_alert(
+                        heading="Launch Error",
+                        body=f"Failed to launch application: {e}",
+                    )
     
-    def on_yes_clicked(self):
-        # Install the app bundle
-        if install_app_bundle(self.file):
-            mark_app_prompted(self.app_path)
-            # Launch the installed app
-            self.launch_installed_app()
-        self.close()
-    
-    def on_no_clicked(self):
-        # Mark as prompted but don't install
-        mark_app_prompted(self.app_path)
-        # Launch the app
-        self.launch_app()
-        self.close()
-    
-    def launch_app(self):
-        """Launch the app from the original location"""
-        import subprocess
-        exec_path = get_app_exec_path(self.app_path)
-        if exec_path and os.path.exists(exec_path):
-            try:
-                os.chmod(exec_path, 0o755)
-                subprocess.Popen([exec_path], cwd=os.path.dirname(exec_path))
-            except Exception as e:
-                message_alert(
-                    heading="Launch Error",
-                    body=f"Failed to launch application: {e}",
-                )
-    
-    def launch_installed_app(self):
-        """Launch the app from the installed location"""
-        import subprocess
-        installed_app_path = os.path.expanduser(f"~/Applications/{self.file.get_name()}")
-        exec_path = get_app_exec_path(installed_app_path)
-        if exec_path and os.path.exists(exec_path):
-            try:
-                os.chmod(exec_path, 0o755)
-                subprocess.Popen([exec_path], cwd=os.path.dirname(exec_path))
-            except Exception as e:
-                message_alert(
-                    heading="Launch Error",
-                    body=f"Failed to launch application: {e}",
-                )
+    return InstallDialog
+
+
+def get_install_dialog_class():
+    """Get the InstallDialog class, creating it on first call"""
+    global _INSTALL_DIALOG_CLASS
+    if _INSTALL_DIALOG_CLASS is None:
+        _INSTALL_DIALOG_CLASS = _make_install_dialog_class()
+    return _INSTALL_DIALOG_CLASS
 
 
 class AppBundleMenuProvider(GObject.GObject, Nautilus.MenuProvider):
@@ -371,18 +782,34 @@ class AppBundleMenuProvider(GObject.GObject, Nautilus.MenuProvider):
 
 class AppBundleInfoProvider(GObject.GObject, Nautilus.InfoProvider):
     def update_file_info(self, file: Nautilus.FileInfo) -> Nautilus.OperationResult:
-        if not is_app_bundle(file):
+        # Fast path for ordinary files: one string compare, no filesystem access
+        if not file.get_name().endswith('.app'):
+            return Nautilus.OperationResult.COMPLETE
+        
+        desktop_info = _get_bundle_info(file)
+        if not desktop_info:
             return Nautilus.OperationResult.COMPLETE
         
         # Set custom icon if exists
-        icon_path = get_app_icon_path(file)
-        if icon_path and os.path.exists(icon_path):
+        icon_path = get_app_icon_path(file, desktop_info)
+        if icon_path:
+            gfile = file.get_location()
+            app_path = gfile.get_path()
+            icon_uri = f'file://{icon_path}'
+            
+            # Already set during this session, on this same directory. A bundle
+            # re-extracted at the same path has a new inode and lost its metadata.
+            icon_key = (get_bundle_inode(app_path), icon_uri)
+            if _cache_get(_CUSTOM_ICONS, app_path) == icon_key:
+                return Nautilus.OperationResult.COMPLETE
+            
             try:
-                # Set the custom icon using Gio metadata
-                gfile = file.get_location()
+                # Set the custom icon using Gio metadata, unless it is already set
                 file_info = gfile.query_info('metadata::custom-icon', Gio.FileQueryInfoFlags.NONE, None)
-                file_info.set_attribute_string('metadata::custom-icon', f'file://{icon_path}')
-                gfile.set_attributes_from_info(file_info, Gio.FileQueryInfoFlags.NONE, None)
+                if file_info.get_attribute_string('metadata::custom-icon') != icon_uri:
+                    file_info.set_attribute_string('metadata::custom-icon', icon_uri)
+                    gfile.set_attributes_from_info(file_info, Gio.FileQueryInfoFlags.NONE, None)
+                _cache_put(_CUSTOM_ICONS, app_path, icon_key)
             except:
                 pass
         